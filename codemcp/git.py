@@ -1,8 +1,12 @@
 #!/usr/bin/env python3
 
+import concurrent.futures
+import functools
 import logging
 import os
-import subprocess
+import stat
+import threading
+from typing import Any, Literal, Optional
 
 from .common import normalize_file_path
 from .shell import run_command
@@ -11,54 +15,364 @@ __all__ = [
     "is_git_repository",
     "commit_pending_changes",
     "commit_changes",
+    "invalidate_git_cache",
 ]
 
+PathKind = Literal["file", "dir", "missing"]
+IndexSignature = Optional[tuple[int, int, int]]
+
+# Runs independent, read-only git commands alongside the main git operation
+_executor = concurrent.futures.ThreadPoolExecutor(
+    max_workers=4, thread_name_prefix="codemcp-git"
+)
+
+
+@functools.cache
+def _load_pygit2() -> Any:
+    """Import pygit2 on first use, so it costs nothing until git is needed.
+
+    Returns:
+        The pygit2 module, or None if it is not installed
+
+    """
+    try:
+        import pygit2
+    except ImportError:
+        return None
+    return pygit2
 
-def is_git_repository(path: str) -> bool:
-    """Check if the path is within a Git repository.
+
+# Repositories opened in-process with pygit2, keyed by repository root; the
+# lock guards both the cache and the use of the repositories in it
+_repo_cache: dict[str, Any] = {}
+_repo_lock = threading.Lock()
+
+
+def _open_repository(repo_root: str) -> Any:
+    """Open a repository in-process with pygit2, if it is installed.
 
     Args:
-        path: The file path to check
+        repo_root: The root directory of the repository
 
     Returns:
-        True if path is in a Git repository, False otherwise
+        A pygit2.Repository, or None if pygit2 is unavailable or cannot open
+        the repository
+
+    """
+    pygit2 = _load_pygit2()
+    if pygit2 is None:
+        return None
+    with _repo_lock:
+        repo = _repo_cache.get(repo_root)
+        if repo is None:
+            try:
+                repo = pygit2.Repository(repo_root)
+            except (pygit2.GitError, OSError, KeyError) as e:
+                logging.debug(f"pygit2 could not open {repo_root}: {e!s}")
+                return None
+            _repo_cache[repo_root] = repo
+        return repo
+
+
+def _discover_repo_root(directory: str) -> Optional[str]:
+    """Find the working tree root of the repository containing a directory
+    in-process with pygit2.
+
+    Args:
+        directory: The normalized absolute directory to check
+
+    Returns:
+        The repository root, or None if pygit2 is unavailable or did not find
+        a working tree; callers should then fall back to git itself
 
     """
+    pygit2 = _load_pygit2()
+    if pygit2 is None:
+        return None
     try:
-        # Get the directory containing the file or use the path itself if it's a directory
-        directory = os.path.dirname(path) if os.path.isfile(path) else path
+        git_dir = pygit2.discover_repository(directory)
+        if git_dir is None:
+            return None
+        repo = pygit2.Repository(git_dir)
+    except (pygit2.GitError, OSError, KeyError):
+        return None
+
+    # Bare repositories and paths inside the .git directory are not in a
+    # working tree, as far as git rev-parse is concerned
+    git_dir = os.path.realpath(git_dir)
+    real_directory = os.path.realpath(directory)
+    if repo.workdir is None or (
+        os.path.commonpath([git_dir, real_directory]) == git_dir
+    ):
+        return None
+
+    repo_root = os.path.realpath(repo.workdir)
+    with _repo_lock:
+        _repo_cache.setdefault(repo_root, repo)
+    return repo_root
+
+
+@functools.lru_cache(maxsize=1024)
+def _resolve_repo_root(directory: str) -> tuple[bool, Optional[str]]:
+    """Determine whether a directory is in a Git repository and find its root.
+
+    Results are memoized per directory for the lifetime of the process; call
+    invalidate_git_cache() if repositories are created or removed.
 
-        # Get the absolute path to ensure consistency
-        directory = os.path.abspath(directory)
+    Args:
+        directory: The normalized absolute directory to check
 
-        # Run git command to verify this is a git repository
-        run_command(
-            ["git", "rev-parse", "--is-inside-work-tree"],
-            cwd=directory,
-            check=True,
-            capture_output=True,
-            text=True,
-        )
+    Returns:
+        A tuple of (is_repo, repo_root); repo_root is None if directory is not
+        inside a Git working tree
 
-        # Also get the repository root to use for all git operations
-        try:
-            run_command(
-                ["git", "rev-parse", "--show-toplevel"],
-                cwd=directory,
-                check=True,
-                capture_output=True,
-                text=True,
-            ).stdout.strip()
+    Raises:
+        OSError: If git cannot be run in the directory (e.g. it does not exist
+            yet); these failures are deliberately not cached
 
-            # Store the repository root in a global or class variable if needed
-            # This could be used to ensure all git operations use the same root
+    """
+    repo_root = _discover_repo_root(directory)
+    if repo_root is not None:
+        return True, repo_root
 
-            return True
-        except (subprocess.SubprocessError, OSError):
-            # If we can't get the repo root, it's not a proper git repository
-            return False
-    except (subprocess.SubprocessError, OSError):
+    # A single rev-parse answers both questions: the first line of output is
+    # "true" inside a working tree, the second is the repository root. Outside
+    # a repository it simply exits non-zero, so no exception is involved.
+    result = run_command(
+        ["git", "rev-parse", "--is-inside-work-tree", "--show-toplevel"],
+        cwd=directory,
+        check=False,
+        capture_output=True,
+        text=True,
+    )
+    if result.returncode != 0:
+        return False, None
+
+    lines = result.stdout.splitlines()
+    if len(lines) < 2 or lines[0].strip() != "true":
+        return False, None
+
+    return True, lines[1].strip()
+
+
+def _path_kind(path: str) -> tuple[str, PathKind]:
+    """Get the absolute path and kind of a path with a single stat call.
+
+    Args:
+        path: The path to inspect
+
+    Returns:
+        A tuple of (abs_path, kind); kind is 'missing' for anything that is
+        neither a regular file nor a directory
+
+    """
+    abs_path = os.path.abspath(path)
+    try:
+        mode = os.stat(abs_path).st_mode
+    except (OSError, ValueError):
+        return abs_path, "missing"
+    if stat.S_ISREG(mode):
+        return abs_path, "file"
+    if stat.S_ISDIR(mode):
+        return abs_path, "dir"
+    return abs_path, "missing"
+
+
+def _resolve_repo(abs_path: str, kind: PathKind) -> tuple[bool, Optional[str]]:
+    """Determine whether a path is in a Git repository and find its root.
+
+    Args:
+        abs_path: The absolute file or directory path to check
+        kind: The kind of the path, as returned by _path_kind
+
+    Returns:
+        A tuple of (is_repo, repo_root); repo_root is None if path is not
+        inside a Git working tree
+
+    """
+    # Get the directory containing the file or use the path itself if it's a directory
+    directory = os.path.dirname(abs_path) if kind == "file" else abs_path
+
+    try:
+        return _resolve_repo_root(directory)
+    except OSError:
+        return False, None
+
+
+# Signature of the index file and the repository-relative paths it tracks,
+# keyed by repository root
+_tracked_files_cache: dict[str, tuple[IndexSignature, set[str]]] = {}
+
+
+def _repo_relative_path(repo_root: str, file_path: str) -> str:
+    """Get the path of a file relative to its repository root, as git prints it."""
+    rel_path = os.path.relpath(os.path.realpath(file_path), os.path.realpath(repo_root))
+    return rel_path.replace(os.sep, "/")
+
+
+@functools.lru_cache(maxsize=None)
+def _index_path(repo_root: str) -> str:
+    """Get the path of the index file of a repository.
+
+    Args:
+        repo_root: The root directory of the repository
+
+    Returns:
+        The absolute path of the index file
+
+    """
+    dot_git = os.path.join(repo_root, ".git")
+    if os.path.isdir(dot_git):
+        return os.path.join(dot_git, "index")
+
+    # Worktrees and submodules keep their git directory elsewhere
+    result = run_command(
+        ["git", "rev-parse", "--git-path", "index"],
+        cwd=repo_root,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return os.path.join(repo_root, result.stdout.strip())
+
+
+def _index_signature(repo_root: str) -> IndexSignature:
+    """Get a value that changes whenever the index of a repository is written.
+
+    git replaces the index through a lock file and a rename, so its inode
+    changes on every write.
+
+    Args:
+        repo_root: The root directory of the repository
+
+    Returns:
+        A tuple of (inode, mtime_ns, size), or None if there is no index yet
+
+    """
+    try:
+        st = os.stat(_index_path(repo_root))
+    except FileNotFoundError:
+        return None
+    return st.st_ino, st.st_mtime_ns, st.st_size
+
+
+def _list_tracked_files(repo_root: str) -> set[str]:
+    """List every file in the index of a repository with a single git call.
+
+    Args:
+        repo_root: The root directory of the repository
+
+    Returns:
+        The set of tracked paths, relative to the repository root
+
+    """
+    result = run_command(
+        ["git", "ls-files", "-z", "--cached"],
+        cwd=repo_root,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return {path for path in result.stdout.split("\0") if path}
+
+
+def _is_tracked(repo_root: str, file_path: str) -> bool:
+    """Check if a file is in the index of its repository.
+
+    The listing of the index is cached per repository and refreshed whenever
+    the index file changes, so files staged or removed outside of codemcp
+    are picked up.
+
+    Args:
+        repo_root: The root directory of the repository
+        file_path: The path to the file to check
+
+    Returns:
+        True if the file is tracked, False otherwise
+
+    """
+    rel_path = _repo_relative_path(repo_root, file_path)
+
+    # Take the signature before listing, so a concurrent write to the index
+    # makes the next check list it again
+    signature = _index_signature(repo_root)
+    cached = _tracked_files_cache.get(repo_root)
+    if cached is None or cached[0] != signature:
+        cached = (signature, _list_tracked_files(repo_root))
+        _tracked_files_cache[repo_root] = cached
+    return rel_path in cached[1]
+
+
+# Attributes that change how a file is staged but are not applied by libgit2
+_UNSUPPORTED_ATTRIBUTES = ("filter", "working-tree-encoding")
+
+
+def _stage_in_process(repo_root: str, file_paths: list[str]) -> bool:
+    """Add files to the index in-process with pygit2.
+
+    Args:
+        repo_root: The root directory of the repository
+        file_paths: The paths of the files to stage
+
+    Returns:
+        True if the files were staged, False if the caller should fall back
+        to git add (pygit2 is unavailable, a file is ignored or has an
+        attribute libgit2 does not apply, or staging failed)
+
+    """
+    repo = _open_repository(repo_root)
+    if repo is None:
         return False
+    pygit2 = _load_pygit2()
+    with _repo_lock:
+        try:
+            repo.index.read(True)
+            rel_paths = [_repo_relative_path(repo_root, path) for path in file_paths]
+            for rel_path in rel_paths:
+                # Let git add report ignored files the way it normally does
+                if repo.path_is_ignored(rel_path) and rel_path not in repo.index:
+                    return False
+                # libgit2 does not run clean filters such as git-lfs, nor
+                # re-encode files from their working tree encoding
+                if any(
+                    repo.get_attr(rel_path, name) is not None
+                    for name in _UNSUPPORTED_ATTRIBUTES
+                ):
+                    return False
+            for rel_path in rel_paths:
+                repo.index.add(rel_path)
+            repo.index.write()
+        except (pygit2.GitError, OSError, KeyError) as e:
+            logging.debug(f"pygit2 could not stage files: {e!s}")
+            try:
+                repo.index.read(True)
+            except (pygit2.GitError, OSError):
+                pass
+            return False
+    return True
+
+
+def invalidate_git_cache() -> None:
+    """Clear the memoized repository lookups used by the git helpers."""
+    _resolve_repo_root.cache_clear()
+    _index_path.cache_clear()
+    _tracked_files_cache.clear()
+    with _repo_lock:
+        _repo_cache.clear()
+
+
+def is_git_repository(path: str) -> bool:
+    """Check if the path is within a Git repository.
+
+    Args:
+        path: The file path to check
+
+    Returns:
+        True if path is in a Git repository, False otherwise
+
+    """
+    is_repo, _ = _resolve_repo(*_path_kind(path))
+    return is_repo
 
 
 def commit_pending_changes(file_path: str) -> tuple[bool, str]:
@@ -73,37 +387,38 @@ def commit_pending_changes(file_path: str) -> tuple[bool, str]:
     """
     try:
         # First, check if this is a git repository
-        if not is_git_repository(file_path):
+        is_repo, repo_root = _resolve_repo(*_path_kind(file_path))
+        if not is_repo or repo_root is None:
             return False, "File is not in a Git repository"
 
         directory = os.path.dirname(file_path)
 
-        # Check if the file is tracked by git
-        file_status = run_command(
-            ["git", "ls-files", "--error-unmatch", file_path],
+        # Check the working directory for uncommitted changes in the
+        # background while we check whether the file is tracked
+        status_future = _executor.submit(
+            run_command,
+            ["git", "status", "--porcelain"],
             cwd=directory,
             capture_output=True,
+            check=True,
             text=True,
-            check=False,
         )
 
-        file_is_tracked = file_status.returncode == 0
+        # Check if the file is tracked by git
+        file_is_tracked = _is_tracked(repo_root, file_path)
 
-        # If the file is not tracked, return an error
+        # If the file is not tracked, return an error, making sure the
+        # background git status is no longer touching the repository
         if not file_is_tracked:
+            if not status_future.cancel():
+                concurrent.futures.wait([status_future])
             return (
                 False,
                 "File is not tracked by git. Please add the file to git tracking first using 'git add <file>'",
             )
 
         # Check if working directory has uncommitted changes
-        status_result = run_command(
-            ["git", "status", "--porcelain"],
-            cwd=directory,
-            capture_output=True,
-            check=True,
-            text=True,
-        )
+        status_result = status_future.result()
 
         # If there are uncommitted changes (besides our target file), commit them first
         if status_result.stdout and file_is_tracked:
@@ -133,7 +448,7 @@ def commit_pending_changes(file_path: str) -> tuple[bool, str]:
                     cwd=directory,
                     check=True,
                     capture_output=True,
-                    text=True,
+                    text=False,
                 )
 
                 run_command(
@@ -141,7 +456,7 @@ def commit_pending_changes(file_path: str) -> tuple[bool, str]:
                     cwd=directory,
                     check=True,
                     capture_output=True,
-                    text=True,
+                    text=False,
                 )
 
                 return True, "Committed pending changes"
@@ -167,67 +482,53 @@ def commit_changes(path: str, description: str) -> tuple[bool, str]:
 
     """
     try:
-        # First, check if this is a git repository
-        if not is_git_repository(path):
+        # Check that this is a git repository and find its root in one go
+        abs_path, kind = _path_kind(path)
+        is_repo, repo_root = _resolve_repo(abs_path, kind)
+        if not is_repo or repo_root is None:
             return False, f"Path '{path}' is not in a Git repository"
 
-        # Get absolute paths for consistency
-        abs_path = os.path.abspath(path)
-
-        # Get the directory - if path is a file, use its directory, otherwise use the path itself
-        directory = os.path.dirname(abs_path) if os.path.isfile(abs_path) else abs_path
-
-        # Try to get the git repository root for more reliable operations
-        try:
-            repo_root = run_command(
-                ["git", "rev-parse", "--show-toplevel"],
-                cwd=directory,
-                check=True,
-                capture_output=True,
-                text=True,
-            ).stdout.strip()
-
-            # Use the repo root as the working directory for git commands
-            git_cwd = repo_root
-        except (subprocess.SubprocessError, OSError):
-            # Fall back to the directory if we can't get the repo root
-            git_cwd = directory
-
-        # If it's a file, check if it exists
-        if os.path.isfile(abs_path) and not os.path.exists(abs_path):
-            return False, f"File does not exist: {abs_path}"
+        # Use the repo root as the working directory for git commands
+        git_cwd = repo_root
 
         # Add the path to git - could be a file or directory
         try:
             # If path is a directory, do git add .
-            add_command = (
-                ["git", "add", "."]
-                if os.path.isdir(abs_path)
-                else ["git", "add", abs_path]
-            )
-
-            add_result = run_command(
-                add_command,
+            add_all = kind == "dir"
+            add_command = ["git", "add", "."] if add_all else ["git", "add", abs_path]
+
+            # Whether HEAD exists does not depend on the index, so look it up
+            # while git add runs
+            rev_parse_future = _executor.submit(
+                run_command,
+                ["git", "rev-parse", "--verify", "HEAD"],
                 cwd=git_cwd,
                 capture_output=True,
-                text=True,
+                text=False,
                 check=False,
             )
+
+            # Stage a single file in-process when pygit2 is available
+            if not add_all and _stage_in_process(repo_root, [abs_path]):
+                add_result = None
+            else:
+                add_result = run_command(
+                    add_command,
+                    cwd=git_cwd,
+                    capture_output=True,
+                    text=False,
+                    check=False,
+                )
         except Exception as e:
             return False, f"Failed to add to Git: {str(e)}"
 
-        if add_result.returncode != 0:
-            return False, f"Failed to add to Git: {add_result.stderr}"
+        if add_result is not None and add_result.returncode != 0:
+            stderr = add_result.stderr.decode("utf-8", "replace")
+            return False, f"Failed to add to Git: {stderr}"
 
         # First check if there's already a commit in the repository
         has_commits = False
-        rev_parse_result = run_command(
-            ["git", "rev-parse", "--verify", "HEAD"],
-            cwd=git_cwd,
-            capture_output=True,
-            text=True,
-            check=False,
-        )
+        rev_parse_result = rev_parse_future.result()
 
         has_commits = rev_parse_result.returncode == 0
 
@@ -238,7 +539,7 @@ def commit_changes(path: str, description: str) -> tuple[bool, str]:
                 ["git", "diff-index", "--cached", "--quiet", "HEAD"],
                 cwd=git_cwd,
                 capture_output=True,
-                text=True,
+                text=False,
                 check=False,
             )
 
@@ -254,12 +555,13 @@ def commit_changes(path: str, description: str) -> tuple[bool, str]:
             ["git", "commit", "-m", description],
             cwd=git_cwd,
             capture_output=True,
-            text=True,
+            text=False,
             check=False,
         )
 
         if commit_result.returncode != 0:
-            return False, f"Failed to commit changes: {commit_result.stderr}"
+            stderr = commit_result.stderr.decode("utf-8", "replace")
+            return False, f"Failed to commit changes: {stderr}"
 
         return True, "Changes committed successfully"
     except Exception as e:
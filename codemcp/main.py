@@ -5,13 +5,13 @@ import os
 
 from mcp.server.fastmcp import Context, FastMCP
 
-from .tools.edit_file import edit_file_content
+from .tools.edit_file import edit_file_content_async
 from .tools.grep import grep_files
 from .tools.init_project import init_project
 from .tools.ls import ls_directory
 from .tools.read_file import read_file_content
 from .tools.run_command import run_command
-from .tools.write_file import write_file_content
+from .tools.write_file import write_file_content_async
 
 # Initialize FastMCP server
 mcp = FastMCP("codemcp")
@@ -114,7 +114,7 @@ async def codemcp(
             return "Error: description is required for WriteFile subtool"
 
         content_str = content or ""
-        return write_file_content(path, content_str, description)
+        return await write_file_content_async(path, content_str, description)
 
     if subtool == "EditFile":
         if path is None:
@@ -129,7 +129,9 @@ async def codemcp(
         old_content = old_string or old_str or ""
         # Accept either new_string or new_str (prefer new_string if both are provided)
         new_content = new_string or new_str or ""
-        return edit_file_content(path, old_content, new_content, None, description)
+        return await edit_file_content_async(
+            path, old_content, new_content, None, description
+        )
 
     if subtool == "LS":
         if path is None:
@@ -1,11 +1,15 @@
 #!/usr/bin/env python3
 
 import logging
+import mmap
 import os
+import re
 from typing import Dict, List, Optional, Tuple
 
 from .file_utils import (
     check_file_path_and_permissions,
+    run_file_operation,
+    write_bytes_content,
     write_text_content,
 )
 
@@ -14,9 +18,15 @@ logger = logging.getLogger(__name__)
 
 __all__ = [
     "edit_file_content",
+    "edit_file_contents",
+    "edit_file_content_async",
+    "apply_edits_batch",
     "detect_file_encoding",
 ]
 
+# Files larger than this are edited through a memory map without decoding
+_MMAP_THRESHOLD = 1 << 20
+
 
 def detect_file_encoding(file_path: str) -> str:
     """Detect the encoding of a file.
@@ -32,6 +42,210 @@ def detect_file_encoding(file_path: str) -> str:
     return "utf-8"
 
 
+def _read_for_edit(file_path: str) -> Tuple[str, str]:
+    """Read a file for editing in a single pass.
+
+    Args:
+        file_path: The path to the file
+
+    Returns:
+        A tuple of (content, line_endings), where content has its line endings
+        normalized to '\n' and line_endings are those detected in the file
+        ('\n' or '\r\n')
+
+    """
+    with open(file_path, "rb") as f:
+        raw = f.read()
+
+    # Sniff the line endings from the same bytes we decode, and normalize
+    # to '\n' the way a text-mode read would
+    line_endings = "\r\n" if b"\r\n" in raw else "\n"
+    content = raw.decode(detect_file_encoding(file_path))
+    if "\r" in content:
+        content = content.replace("\r\n", "\n").replace("\r", "\n")
+    return content, line_endings
+
+
+def _alternation_pattern(replacements: Dict[str, List[str]]) -> "re.Pattern[str]":
+    """Compile a pattern matching any old string that has replacements left.
+
+    Longer strings come first so the longest match at a position wins.
+    """
+    old_strings = [old for old, pending in replacements.items() if pending]
+    return re.compile(
+        "|".join(re.escape(old) for old in sorted(old_strings, key=len, reverse=True))
+    )
+
+
+def _replace_in_one_pass(content: str, edits: List[Tuple[str, str]]) -> Optional[str]:
+    """Apply several edits to content with a single scan.
+
+    Each edit replaces one occurrence of its old string; edits sharing the same
+    old string replace successive occurrences in order.
+
+    Args:
+        content: The content to edit
+        edits: A list of (old_string, new_string) pairs
+
+    Returns:
+        The updated content, or None if some old string could not be found
+
+    """
+    replacements: Dict[str, List[str]] = {}
+    for old_string, new_string in edits:
+        replacements.setdefault(old_string, []).append(new_string)
+
+    pattern = _alternation_pattern(replacements)
+    chunks: List[str] = []
+    last_end = 0
+    remaining = len(edits)
+    position = 0
+    while remaining:
+        match = pattern.search(content, position)
+        if match is None:
+            break
+        pending = replacements[match.group()]
+        if not pending:
+            # This old string is used up, but a shorter one may still match
+            # here; search again from the same position without it
+            pattern = _alternation_pattern(replacements)
+            position = match.start()
+            continue
+        chunks.append(content[last_end : match.start()])
+        chunks.append(pending.pop(0))
+        last_end = position = match.end()
+        remaining -= 1
+
+    if remaining:
+        return None
+
+    chunks.append(content[last_end:])
+    return "".join(chunks)
+
+
+def _edit_large_file(file_path: str, old_string: str, new_string: str) -> bool:
+    """Apply a single edit to a large file directly on its bytes.
+
+    The file is memory-mapped and searched without decoding it, and the
+    updated bytes are assembled from slices of the mapping. This only applies
+    to ASCII edits, whose bytes are the same in any ASCII-compatible encoding,
+    and to files without carriage returns, whose line endings need no
+    converting. Both old_string and any carriage return are looked for in a
+    single scan of the file.
+
+    Args:
+        file_path: The path to the file
+        old_string: The text to replace
+        new_string: The text to replace it with
+
+    Returns:
+        True if the edit was applied, or False if the edit or file is not
+        eligible or old_string was not found, and the regular path should be
+        used
+
+    """
+    if (
+        not old_string.isascii()
+        or not new_string.isascii()
+        or "\r" in old_string
+        or os.path.getsize(file_path) <= _MMAP_THRESHOLD
+    ):
+        return False
+
+    old_bytes = old_string.encode("ascii")
+    pattern = re.compile(b"\r|" + re.escape(old_bytes))
+    with (
+        open(file_path, "rb") as f,
+        mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm,
+    ):
+        # Leave files whose line endings need converting to the regular path,
+        # and let it report a missing old_string; the rest of the file after
+        # the match is only searched for carriage returns
+        match = pattern.search(mm)
+        if match is None or match.group() == b"\r":
+            return False
+        index = match.start()
+        if mm.find(b"\r", index + len(old_bytes)) >= 0:
+            return False
+        if new_string == old_string:
+            return True
+
+        # Build the result before the mapping is closed and the file replaced,
+        # giving new_string the file's LF line endings
+        updated = b"".join(
+            (
+                mm[:index],
+                new_string.replace("\r\n", "\n").encode("ascii"),
+                mm[index + len(old_bytes) :],
+            )
+        )
+
+    write_bytes_content(file_path, updated)
+    return True
+
+
+def _apply_edits(
+    file_path: str,
+    edits: List[Tuple[str, str]],
+) -> Tuple[List[Dict[str, str]], str, str]:
+    """Apply edits to a file, reading it only once.
+
+    Args:
+        file_path: The path to the file
+        edits: A list of (old_string, new_string) pairs
+
+    Returns:
+        A tuple of (patch, updated_file, line_endings), where line_endings are
+        the line endings detected in the original file ('\n' or '\r\n');
+        the patch is empty if any edit could not be applied
+
+    """
+    if not edits or not os.path.exists(file_path):
+        return [], "", "\n"
+
+    content, line_endings = _read_for_edit(file_path)
+
+    if len(edits) == 1:
+        # Apply the edit to the first occurrence, scanning the content only once
+        old_string, new_string = edits[0]
+        index = content.find(old_string)
+        if index < 0:
+            return [], "", "\n"
+        updated_content = (
+            content
+            if new_string == old_string
+            else content[:index] + new_string + content[index + len(old_string) :]
+        )
+    else:
+        updated_content = _replace_in_one_pass(content, edits)
+        if updated_content is None:
+            return [], "", "\n"
+
+    # Create a patch list to track changes
+    patches: List[Dict[str, str]] = [
+        {"old": old_string, "new": new_string} for old_string, new_string in edits
+    ]
+    return patches, updated_content, line_endings
+
+
+def apply_edits_batch(
+    file_path: str,
+    edits: List[Tuple[str, str]],
+) -> Tuple[List[Dict[str, str]], str]:
+    """Apply several edits to a file with one read and one scan.
+
+    Args:
+        file_path: The path to the file
+        edits: A list of (old_string, new_string) pairs
+
+    Returns:
+        A tuple of (patch, updated_file)
+
+    """
+    patches, updated_content, _ = _apply_edits(file_path, edits)
+    return patches, updated_content
+
+
 def apply_edit(
     file_path: str,
     old_string: str,
@@ -48,35 +262,23 @@ def apply_edit(
         A tuple of (patch, updated_file)
 
     """
-    if os.path.exists(file_path):
-        with open(file_path, encoding=detect_file_encoding(file_path)) as f:
-            content = f.read()
-            
-        # Create a patch list to track changes
-        patches: List[Dict[str, str]] = []
-        
-        # Apply the edit
-        if old_string in content:
-            updated_content = content.replace(old_string, new_string)
-            patches.append({"old": old_string, "new": new_string})
-            return patches, updated_content
-            
-    return [], ""
+    return apply_edits_batch(file_path, [(old_string, new_string)])
 
 
-def edit_file_content(
+def edit_file_contents(
     file_path: str,
-    old_string: str,
-    new_string: str,
+    edits: List[Tuple[str, str]],
     read_file_timestamps: Optional[Dict[str, float]] = None,
     description: str = "",
 ) -> str:
-    """Edit a file by replacing old_string with new_string.
+    """Edit a file by applying several (old_string, new_string) replacements.
+
+    The file is read once, all edits are applied in a single scan, and the
+    result is written once. Either every edit is applied or none is.
 
     Args:
         file_path: The path to the file to edit
-        old_string: The text to replace
-        new_string: The text to replace it with
+        edits: A list of (old_string, new_string) pairs
         read_file_timestamps: Optional dict of file paths to timestamps
         description: Short description of the change (for logging purposes)
 
@@ -84,8 +286,7 @@ def edit_file_content(
         A success or error message
 
     Note:
-        This function allows creating new files if old_string is empty.
-        It will write directly to the local filesystem without Git integration.
+        A single edit with an empty old_string creates a new file.
 
     """
     try:
@@ -95,25 +296,93 @@ def edit_file_content(
             return error_message or "Invalid file path or permissions"
 
         # If old_string is empty, this is a new file creation
-        if not old_string:
+        if len(edits) == 1 and not edits[0][0]:
             # Write the new file
-            write_text_content(file_path, new_string)
+            write_text_content(file_path, edits[0][1])
             return f"Successfully created new file {file_path}"
 
+        if any(not old_string for old_string, _ in edits):
+            return "Error: old_string must not be empty when applying several edits"
+
         # For existing files, apply the edit
         if not os.path.exists(file_path):
             return f"Error: File does not exist: {file_path}"
 
-        # Apply the edit
-        patches, updated_content = apply_edit(file_path, old_string, new_string)
+        # Edit large files directly on their bytes where possible
+        if len(edits) == 1:
+            if _edit_large_file(file_path, *edits[0]):
+                return f"Successfully edited {file_path}"
+
+        # Apply the edits
+        patches, updated_content, line_endings = _apply_edits(file_path, edits)
         if not patches:
             return "Error: Could not find text to replace"
 
-        # Write the updated content
-        write_text_content(file_path, updated_content)
+        # Replacing text with itself leaves the file as it is
+        if all(new_string == old_string for old_string, new_string in edits):
+            return f"Successfully edited {file_path}"
+
+        # Write the updated content, preserving the file's line endings
+        write_text_content(file_path, updated_content, line_endings=line_endings)
 
         return f"Successfully edited {file_path}"
 
     except Exception as e:
         logger.error(f"Error editing file: {e!s}", exc_info=True)
         return f"Error editing file: {e!s}"
+
+
+def edit_file_content(
+    file_path: str,
+    old_string: str,
+    new_string: str,
+    read_file_timestamps: Optional[Dict[str, float]] = None,
+    description: str = "",
+) -> str:
+    """Edit a file by replacing old_string with new_string.
+
+    Args:
+        file_path: The path to the file to edit
+        old_string: The text to replace
+        new_string: The text to replace it with
+        read_file_timestamps: Optional dict of file paths to timestamps
+        description: Short description of the change (for logging purposes)
+
+    Returns:
+        A success or error message
+
+    Note:
+        This function allows creating new files if old_string is empty.
+        It will write directly to the local filesystem without Git integration.
+
+    """
+    return edit_file_contents(
+        file_path, [(old_string, new_string)], read_file_timestamps, description
+    )
+
+
+async def edit_file_content_async(
+    file_path: str,
+    old_string: str,
+    new_string: str,
+    read_file_timestamps: Optional[Dict[str, float]] = None,
+    description: str = "",
+) -> str:
+    """Edit a file without blocking the event loop.
+
+    Takes the same arguments as edit_file_content, which is run in a worker
+    thread so that edits to different files can proceed concurrently.
+
+    Returns:
+        A success or error message
+
+    """
+    return await run_file_operation(
+        file_path,
+        edit_file_content,
+        file_path,
+        old_string,
+        new_string,
+        read_file_timestamps,
+        description,
+    )
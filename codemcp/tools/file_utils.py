@@ -1,7 +1,11 @@
 #!/usr/bin/env python3
 
+import asyncio
+import errno
 import os
-from typing import Optional
+import re
+import stat
+from typing import Any, Callable, Optional, TypeVar
 
 from ..access import check_edit_permission
 
@@ -9,8 +13,32 @@ __all__ = [
     "check_file_path_and_permissions",
     "ensure_directory_exists",
     "write_text_content",
+    "write_bytes_content",
+    "run_file_operation",
 ]
 
+_CRLF_OR_LF = re.compile(r"\r\n|\n")
+
+# Line ending names and sequences accepted by write_text_content
+_LINE_ENDING_MAP = {
+    "CRLF": "\r\n",
+    "LF": "\n",
+    "\r\n": "\r\n",
+    "\n": "\n",
+}
+
+T = TypeVar("T")
+
+# Bound concurrent file operations to 3/4 of the available CPUs
+_MAX_CONCURRENT_FILE_OPERATIONS = max(1, 3 * (os.cpu_count() or 1) // 4)
+_file_operation_semaphore = asyncio.Semaphore(_MAX_CONCURRENT_FILE_OPERATIONS)
+_file_locks: dict[str, asyncio.Lock] = {}
+# Number of operations holding or waiting for each of the locks above
+_file_lock_users: dict[str, int] = {}
+
+# Directories this process has already created or found to exist
+_known_dirs: set[str] = set()
+
 
 def check_file_path_and_permissions(file_path: str) -> tuple[bool, Optional[str]]:
     """Check if the file path is valid and has the necessary permissions.
@@ -43,8 +71,170 @@ def ensure_directory_exists(file_path: str) -> None:
 
     """
     directory = os.path.dirname(file_path)
-    if not os.path.exists(directory):
-        os.makedirs(directory, exist_ok=True)
+    if directory in _known_dirs:
+        return
+    os.makedirs(directory, exist_ok=True)
+    _known_dirs.add(directory)
+
+
+def _file_has_content(file_path: str, data: bytes) -> bool:
+    """Check if a file already contains exactly the given bytes.
+
+    The file is only read if its size matches.
+
+    Args:
+        file_path: The path to the file
+        data: The bytes to compare against
+
+    Returns:
+        True if the file exists and its content equals data, False otherwise
+
+    """
+    try:
+        if os.stat(file_path).st_size != len(data):
+            return False
+        with open(file_path, "rb") as f:
+            return f.read() == data
+    except OSError:
+        return False
+
+
+def _write_bytes_in_place(file_path: str, data: bytes) -> None:
+    """Overwrite a file's content in place, keeping its inode and metadata.
+
+    Args:
+        file_path: The path to the file
+        data: The bytes to write
+
+    """
+    with open(file_path, "wb") as f:
+        f.write(data)
+
+
+def _copy_file_metadata(src_path: str, dst_fd: int, src_stat: os.stat_result) -> bool:
+    """Copy the permission bits, owner and extended attributes of a file.
+
+    Extended attributes include POSIX ACLs on Linux.
+
+    Args:
+        src_path: The path of the file to copy metadata from
+        dst_fd: An open file descriptor of the file to copy metadata to
+        src_stat: The result of os.stat(src_path)
+
+    Returns:
+        True if all metadata was copied, False otherwise
+
+    """
+    try:
+        if hasattr(os, "fchown"):
+            dst_stat = os.fstat(dst_fd)
+            if (dst_stat.st_uid, dst_stat.st_gid) != (
+                src_stat.st_uid,
+                src_stat.st_gid,
+            ):
+                os.fchown(dst_fd, src_stat.st_uid, src_stat.st_gid)
+        if hasattr(os, "listxattr"):
+            try:
+                names = os.listxattr(src_path)
+            except OSError as e:
+                if e.errno not in (errno.ENOTSUP, errno.ENODATA):
+                    raise
+                names = []
+            for name in names:
+                os.setxattr(dst_fd, name, os.getxattr(src_path, name))
+        # Set the mode last, as changing the owner may clear setuid bits
+        if hasattr(os, "fchmod"):
+            os.fchmod(dst_fd, stat.S_IMODE(src_stat.st_mode))
+    except OSError:
+        return False
+    return True
+
+
+def _create_temp_file(real_path: str, mode: int) -> tuple[int, str]:
+    """Exclusively create a new temporary file next to a file.
+
+    Args:
+        real_path: The resolved path of the file the temporary file is for
+        mode: The permission bits to create the file with, before the umask
+
+    Returns:
+        A tuple of (fd, tmp_path) for the new file, opened for writing
+
+    """
+    flags = os.O_WRONLY | os.O_CREAT | os.O_EXCL | getattr(os, "O_NOFOLLOW", 0)
+    while True:
+        tmp_path = f"{real_path}.{os.urandom(6).hex()}.tmp"
+        try:
+            return os.open(tmp_path, flags, mode), tmp_path
+        except FileExistsError:
+            continue
+
+
+def _write_bytes_atomic(file_path: str, data: bytes) -> None:
+    """Write bytes to a file atomically via a temporary file and os.replace.
+
+    Symlinks are followed, so the file they point to is replaced and the link
+    is kept. The permission bits, owner and extended attributes of an existing
+    file are preserved, and applied before any content is written; new files
+    get the default permissions after the umask is applied, as with open().
+    Files with several hard links, and files whose metadata cannot be copied,
+    are overwritten in place instead.
+
+    Args:
+        file_path: The path to the file
+        data: The bytes to write
+
+    Raises:
+        PermissionError: If the file exists but is not writable
+
+    """
+    real_path = os.path.realpath(file_path)
+    try:
+        st: Optional[os.stat_result] = os.stat(real_path)
+    except FileNotFoundError:
+        st = None
+
+    if st is not None:
+        # Refuse read-only files, as opening them for writing would
+        if not os.access(real_path, os.W_OK):
+            raise PermissionError(errno.EACCES, os.strerror(errno.EACCES), file_path)
+        # Replacing a hard-linked file would detach it from its other links
+        if st.st_nlink > 1:
+            _write_bytes_in_place(real_path, data)
+            return
+
+    # Only the owner can read the temporary file until it has the existing
+    # file's metadata
+    try:
+        fd, tmp_path = _create_temp_file(real_path, 0o666 if st is None else 0o600)
+    except PermissionError:
+        if st is None:
+            raise
+        # The directory is not writable, but the file itself is
+        _write_bytes_in_place(real_path, data)
+        return
+
+    try:
+        try:
+            copied = st is None or _copy_file_metadata(real_path, fd, st)
+            if copied:
+                view = memoryview(data)
+                offset = 0
+                while offset < len(view):
+                    offset += os.write(fd, view[offset:])
+        finally:
+            os.close(fd)
+        if not copied:
+            os.unlink(tmp_path)
+            _write_bytes_in_place(real_path, data)
+            return
+        os.replace(tmp_path, real_path)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise
 
 
 def write_text_content(
@@ -62,31 +252,79 @@ def write_text_content(
         line_endings: The line endings to use ('CRLF', 'LF', '\r\n', or '\n')
 
     """
-    # Handle different line ending formats: string constants or actual characters
-    if line_endings is not None:
-        if line_endings.upper() == "CRLF":
-            actual_line_endings = "\r\n"
-        elif line_endings.upper() == "LF":
-            actual_line_endings = "\n"
-        else:
-            # Assume it's already the character sequence
-            actual_line_endings = line_endings
-    else:
-        # Default to system line endings if None
+    # Handle different line ending formats: string constants or actual characters,
+    # defaulting to system line endings if None
+    if line_endings is None:
         actual_line_endings = os.linesep
+    else:
+        actual_line_endings = _LINE_ENDING_MAP.get(line_endings) or (
+            _LINE_ENDING_MAP.get(line_endings.upper(), line_endings)
+        )
 
-    # First normalize all line endings to \n
-    normalized_content = content.replace("\r\n", "\n")
-
-    # Then replace with the desired line endings if different from \n
-    if actual_line_endings != "\n":
-        final_content = normalized_content.replace("\n", actual_line_endings)
+    # Convert all line endings to the desired ones in a single pass
+    if actual_line_endings == "\n":
+        final_content = content.replace("\r\n", "\n") if "\r\n" in content else content
     else:
-        final_content = normalized_content
+        final_content = _CRLF_OR_LF.sub(actual_line_endings, content)
+
+    write_bytes_content(file_path, final_content.encode(encoding))
+
+
+def write_bytes_content(file_path: str, data: bytes) -> None:
+    """Write already encoded content to a file as-is.
+
+    Args:
+        file_path: The path to the file
+        data: The bytes to write
+
+    """
+    # Skip the write entirely if the file already holds exactly these bytes
+    if _file_has_content(file_path, data):
+        return
 
     # Ensure directory exists
     ensure_directory_exists(file_path)
 
     # Write the content
-    with open(file_path, "w", encoding=encoding) as f:
-        f.write(final_content)
+    try:
+        _write_bytes_atomic(file_path, data)
+    except FileNotFoundError:
+        # The directory was removed after we cached it; create it and retry
+        directory = os.path.dirname(file_path)
+        if os.path.isdir(directory):
+            raise
+        _known_dirs.discard(directory)
+        ensure_directory_exists(file_path)
+        _write_bytes_atomic(file_path, data)
+
+
+async def run_file_operation(
+    file_path: str, func: Callable[..., T], *args: Any, **kwargs: Any
+) -> T:
+    """Run a blocking file operation in a worker thread.
+
+    Operations on different files run concurrently, up to a limit, while
+    operations on the same file are serialized so edits are not lost.
+
+    Args:
+        file_path: The path to the file the operation works on
+        func: The blocking function to run
+        *args: Positional arguments for func
+        **kwargs: Keyword arguments for func
+
+    Returns:
+        The return value of func
+
+    """
+    key = os.path.abspath(file_path)
+    lock = _file_locks.setdefault(key, asyncio.Lock())
+    _file_lock_users[key] = _file_lock_users.get(key, 0) + 1
+    try:
+        async with lock, _file_operation_semaphore:
+            return await asyncio.to_thread(func, *args, **kwargs)
+    finally:
+        # Drop the lock once nothing holds or waits for it
+        _file_lock_users[key] -= 1
+        if not _file_lock_users[key]:
+            del _file_lock_users[key]
+            del _file_locks[key]
@@ -1,19 +1,26 @@
 #!/usr/bin/env python3
 
+import codecs
 import os
 
 from .file_utils import (
     check_file_path_and_permissions,
+    run_file_operation,
+    write_bytes_content,
     write_text_content,
 )
 
 __all__ = [
     "write_file_content",
+    "write_file_content_async",
     "detect_file_encoding",
     "detect_line_endings",
     "detect_repo_line_endings",
 ]
 
+# Largest content (in characters) eligible for the ASCII/LF write fast path
+_FAST_PATH_MAX_SIZE = 256 * 1024
+
 
 def detect_file_encoding(file_path: str) -> str:
     """Detect the encoding of a file.
@@ -59,6 +66,42 @@ def detect_line_endings(file_path: str) -> str:
         return os.linesep
 
 
+def _sniff_file(
+    file_path: str, n: int = 65536, *, detect_encoding: bool = True
+) -> tuple[str, str]:
+    """Detect the encoding and line endings of a file from its first bytes.
+
+    Args:
+        file_path: The path to the file
+        n: The maximum number of bytes to inspect
+        detect_encoding: If False, skip encoding detection and report 'utf-8'
+
+    Returns:
+        A tuple of (encoding, line_endings), defaulting to ('utf-8', os.linesep)
+        if the file cannot be read
+
+    """
+    try:
+        with open(file_path, "rb") as f:
+            buf = f.read(n)
+    except OSError:
+        return "utf-8", os.linesep
+
+    line_endings = "\r\n" if b"\r\n" in buf else "\n"
+    if not detect_encoding:
+        return "utf-8", line_endings
+
+    # Decode incrementally so a multi-byte character cut off at the end of a
+    # partial read is not mistaken for invalid UTF-8
+    try:
+        codecs.getincrementaldecoder("utf-8")().decode(buf, final=len(buf) < n)
+        encoding = "utf-8"
+    except UnicodeDecodeError:
+        encoding = "latin-1"
+
+    return encoding, line_endings
+
+
 def detect_repo_line_endings(directory: str) -> str:
     """Detect the line endings used in a directory.
 
@@ -95,17 +138,23 @@ def write_file_content(file_path: str, content: str, description: str = "") -> s
         if not is_valid:
             return error_message or "Invalid file path or permissions"
 
-        # Determine encoding and line endings
-        old_file_exists = os.path.exists(file_path)
-        encoding = detect_file_encoding(file_path) if old_file_exists else "utf-8"
+        # Small, pure ASCII content encodes identically in every encoding we
+        # would pick, so only the target line endings matter for it
+        ascii_content = len(content) < _FAST_PATH_MAX_SIZE and content.isascii()
 
-        if old_file_exists:
-            line_endings = detect_line_endings(file_path)
+        # Determine encoding and line endings with a single read of the file
+        if os.path.exists(file_path):
+            encoding, line_endings = _sniff_file(
+                file_path, detect_encoding=not ascii_content
+            )
         else:
+            encoding = "utf-8"
             line_endings = detect_repo_line_endings(os.path.dirname(file_path))
-            # Ensure directory exists for new files
-            directory = os.path.dirname(file_path)
-            os.makedirs(directory, exist_ok=True)
+
+        # Fast path: LF-only ASCII content for an LF file needs no conversion
+        if ascii_content and line_endings == "\n" and "\r" not in content:
+            write_bytes_content(file_path, content.encode("ascii"))
+            return f"Successfully wrote to {file_path}"
 
         # Write the content with proper encoding and line endings
         write_text_content(file_path, content, encoding, line_endings)
@@ -113,3 +162,20 @@ def write_file_content(file_path: str, content: str, description: str = "") -> s
         return f"Successfully wrote to {file_path}"
     except Exception as e:
         return f"Error writing file: {e!s}"
+
+
+async def write_file_content_async(
+    file_path: str, content: str, description: str = ""
+) -> str:
+    """Write content to a file without blocking the event loop.
+
+    Takes the same arguments as write_file_content, which is run in a worker
+    thread so that writes to different files can proceed concurrently.
+
+    Returns:
+        A success message or an error message
+
+    """
+    return await run_file_operation(
+        file_path, write_file_content, file_path, content, description
+    )
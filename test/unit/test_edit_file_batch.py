@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from codemcp.tools.edit_file import apply_edits_batch, edit_file_contents
+
+
+class TestEditFileBatch(unittest.TestCase):
+    def setUp(self):
+        # Create a temporary directory for test files
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.temp_dir.cleanup)
+
+        self.test_file_path = os.path.join(self.temp_dir.name, "test_file.py")
+        with open(self.test_file_path, "w", encoding="utf-8") as f:
+            f.write("foo = 1\nbar = foo + 1\nbaz = bar + foo\n")
+
+        # Bypass the git repository check used for permissions
+        git_base_dir_patch = patch("codemcp.access.get_git_base_dir")
+        self.mock_git_base_dir = git_base_dir_patch.start()
+        self.mock_git_base_dir.return_value = self.temp_dir.name
+        self.addCleanup(git_base_dir_patch.stop)
+
+        # Create a codemcp.toml file to satisfy the permission check
+        config_path = os.path.join(self.temp_dir.name, "codemcp.toml")
+        with open(config_path, "w") as f:
+            f.write("[codemcp]\nenabled = true\n")
+
+    def read_test_file(self):
+        with open(self.test_file_path, encoding="utf-8") as f:
+            return f.read()
+
+    def test_apply_edits_batch(self):
+        """Test applying several distinct edits in one pass"""
+        patches, updated = apply_edits_batch(
+            self.test_file_path,
+            [("bar = foo + 1", "bar = foo + 2"), ("foo = 1", "foo = 10")],
+        )
+        self.assertEqual(len(patches), 2)
+        self.assertEqual(updated, "foo = 10\nbar = foo + 2\nbaz = bar + foo\n")
+
+    def test_apply_edits_batch_repeated_old_string(self):
+        """Test that repeated old strings replace successive occurrences"""
+        patches, updated = apply_edits_batch(
+            self.test_file_path,
+            [("foo", "a"), ("foo", "b"), ("foo", "c")],
+        )
+        self.assertEqual(len(patches), 3)
+        self.assertEqual(updated, "a = 1\nbar = b + 1\nbaz = bar + c\n")
+
+    def test_apply_edits_batch_overlapping_strings(self):
+        """Test that a used-up old string does not hide a shorter match"""
+        with open(self.test_file_path, "w", encoding="utf-8") as f:
+            f.write("abab")
+
+        patches, updated = apply_edits_batch(
+            self.test_file_path, [("ab", "X"), ("b", "Y")]
+        )
+        self.assertEqual(len(patches), 2)
+        self.assertEqual(updated, "XaY")
+
+    def test_apply_edits_batch_missing_string(self):
+        """Test that no edit is applied if any old string is missing"""
+        patches, updated = apply_edits_batch(
+            self.test_file_path,
+            [("foo = 1", "foo = 10"), ("qux", "quux")],
+        )
+        self.assertEqual(patches, [])
+        self.assertEqual(updated, "")
+
+    def test_edit_file_contents(self):
+        """Test editing a file with several edits and a single write"""
+        result = edit_file_contents(
+            self.test_file_path,
+            [("foo = 1", "foo = 2"), ("baz", "qux")],
+        )
+        self.assertEqual(result, f"Successfully edited {self.test_file_path}")
+        self.assertEqual(
+            self.read_test_file(), "foo = 2\nbar = foo + 1\nqux = bar + foo\n"
+        )
+
+    def test_edit_file_contents_missing_string(self):
+        """Test that the file is left untouched if an edit does not apply"""
+        result = edit_file_contents(
+            self.test_file_path,
+            [("foo = 1", "foo = 2"), ("qux", "quux")],
+        )
+        self.assertEqual(result, "Error: Could not find text to replace")
+        self.assertEqual(
+            self.read_test_file(), "foo = 1\nbar = foo + 1\nbaz = bar + foo\n"
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from codemcp.tools import edit_file
+from codemcp.tools.edit_file import edit_file_content
+
+
+class TestEditFileLineEndings(unittest.TestCase):
+    def setUp(self):
+        # Create a temporary directory for test files
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.temp_dir.cleanup)
+
+        self.test_file_path = os.path.join(self.temp_dir.name, "test_file.txt")
+
+        # Bypass the git repository check used for permissions
+        git_base_dir_patch = patch("codemcp.access.get_git_base_dir")
+        self.mock_git_base_dir = git_base_dir_patch.start()
+        self.mock_git_base_dir.return_value = self.temp_dir.name
+        self.addCleanup(git_base_dir_patch.stop)
+
+        # Create a codemcp.toml file to satisfy the permission check
+        config_path = os.path.join(self.temp_dir.name, "codemcp.toml")
+        with open(config_path, "w") as f:
+            f.write("[codemcp]\nenabled = true\n")
+
+    def write_test_file(self, data):
+        with open(self.test_file_path, "wb") as f:
+            f.write(data)
+
+    def read_test_file(self):
+        with open(self.test_file_path, "rb") as f:
+            return f.read()
+
+    def test_edit_crlf_file(self):
+        """Test that editing a CRLF file keeps its CRLF line endings"""
+        self.write_test_file(b"first line\r\nsecond line\r\nthird line\r\n")
+
+        result = edit_file_content(
+            self.test_file_path, "second line\nthird", "2nd line\nnew line\nthird"
+        )
+        self.assertEqual(result, f"Successfully edited {self.test_file_path}")
+        self.assertEqual(
+            self.read_test_file(),
+            b"first line\r\n2nd line\r\nnew line\r\nthird line\r\n",
+        )
+
+    def test_edit_lf_file(self):
+        """Test that editing an LF file keeps its LF line endings"""
+        self.write_test_file(b"first line\nsecond line\n")
+
+        result = edit_file_content(self.test_file_path, "second", "2nd\nextra")
+        self.assertEqual(result, f"Successfully edited {self.test_file_path}")
+        self.assertEqual(self.read_test_file(), b"first line\n2nd\nextra line\n")
+
+    def test_edit_large_lf_file(self):
+        """Test editing a file above the memory-map threshold"""
+        filler = b"x" * 99 + b"\n"
+        lines = edit_file._MMAP_THRESHOLD // len(filler) + 1
+        self.write_test_file(filler * lines + b"old line\n")
+
+        with patch("codemcp.tools.edit_file._read_for_edit") as mock_read:
+            result = edit_file_content(
+                self.test_file_path, "old line\n", "new line\r\nextra line\n"
+            )
+            mock_read.assert_not_called()
+
+        self.assertEqual(result, f"Successfully edited {self.test_file_path}")
+        self.assertEqual(
+            self.read_test_file(), filler * lines + b"new line\nextra line\n"
+        )
+
+    def test_edit_large_crlf_file(self):
+        """Test that a large CRLF file is edited on the regular path"""
+        filler = b"x" * 98 + b"\r\n"
+        lines = edit_file._MMAP_THRESHOLD // len(filler) + 1
+        self.write_test_file(filler * lines + b"old line\r\n")
+
+        result = edit_file_content(self.test_file_path, "old line\n", "new line\n")
+
+        self.assertEqual(result, f"Successfully edited {self.test_file_path}")
+        self.assertEqual(self.read_test_file(), filler * lines + b"new line\r\n")
+
+    def test_edit_large_file_missing_string(self):
+        """Test that a large file is left untouched if the text is missing"""
+        filler = b"x" * 99 + b"\n"
+        lines = edit_file._MMAP_THRESHOLD // len(filler) + 1
+        self.write_test_file(filler * lines)
+
+        result = edit_file_content(self.test_file_path, "missing", "new")
+
+        self.assertEqual(result, "Error: Could not find text to replace")
+        self.assertEqual(self.read_test_file(), filler * lines)
+
+    def test_edit_large_file_crlf_after_first_block(self):
+        """Test that CRLF anywhere in a large file is handled as in a small one"""
+        filler = b"x" * 99 + b"\n"
+        lines = edit_file._MMAP_THRESHOLD // len(filler) + 1
+        self.write_test_file(b"old line\n" + filler * lines + b"crlf line\r\n")
+
+        result = edit_file_content(self.test_file_path, "old line", "new line")
+
+        self.assertEqual(result, f"Successfully edited {self.test_file_path}")
+        crlf_filler = filler.replace(b"\n", b"\r\n")
+        self.assertEqual(
+            self.read_test_file(),
+            b"new line\r\n" + crlf_filler * lines + b"crlf line\r\n",
+        )
+
+    def test_edit_large_non_utf8_file(self):
+        """Test that a large non-UTF-8 file is refused like a small one"""
+        filler = b"x" * 99 + b"\n"
+        lines = edit_file._MMAP_THRESHOLD // len(filler) + 1
+        original = "caf\xe9\n".encode("latin-1") + filler * lines + b"old\n"
+        self.write_test_file(original)
+
+        result = edit_file_content(self.test_file_path, "old", "n\xe9w")
+
+        self.assertTrue(result.startswith("Error editing file"), result)
+        self.assertEqual(self.read_test_file(), original)
+
+
+if __name__ == "__main__":
+    unittest.main()
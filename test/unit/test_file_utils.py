@@ -0,0 +1,216 @@
+#!/usr/bin/env python3
+
+import asyncio
+import os
+import shutil
+import stat
+import tempfile
+import threading
+import time
+import unittest
+from unittest.mock import patch
+
+from codemcp.tools import file_utils
+from codemcp.tools.file_utils import run_file_operation, write_bytes_content
+
+
+class TestWriteBytesContent(unittest.TestCase):
+    def setUp(self):
+        # Create a temporary directory for test files
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.temp_dir.cleanup)
+
+        self.test_file_path = os.path.join(self.temp_dir.name, "test_file.txt")
+        with open(self.test_file_path, "wb") as f:
+            f.write(b"Initial content\n")
+
+    def read_test_file(self):
+        with open(self.test_file_path, "rb") as f:
+            return f.read()
+
+    def test_write_unchanged_content(self):
+        """Test that writing the content a file already has is skipped"""
+        with patch("codemcp.tools.file_utils._write_bytes_atomic") as mock_write:
+            write_bytes_content(self.test_file_path, b"Initial content\n")
+            mock_write.assert_not_called()
+
+            write_bytes_content(self.test_file_path, b"Changed content\n")
+            mock_write.assert_called_once_with(
+                self.test_file_path, b"Changed content\n"
+            )
+
+    def test_write_through_symlink(self):
+        """Test that writing through a symlink updates its target"""
+        link_path = os.path.join(self.temp_dir.name, "link.txt")
+        os.symlink(self.test_file_path, link_path)
+
+        write_bytes_content(link_path, b"New content\n")
+
+        self.assertTrue(os.path.islink(link_path))
+        self.assertEqual(self.read_test_file(), b"New content\n")
+        self.assertEqual(
+            sorted(os.listdir(self.temp_dir.name)), ["link.txt", "test_file.txt"]
+        )
+
+    def test_write_ignores_planted_temp_symlink(self):
+        """Test that a symlink at a temporary file name is never written through"""
+        victim_path = os.path.join(self.temp_dir.name, "victim.txt")
+        with open(victim_path, "wb") as f:
+            f.write(b"Victim content\n")
+        os.symlink(victim_path, f"{self.test_file_path}.{'00' * 6}.tmp")
+
+        with patch(
+            "codemcp.tools.file_utils.os.urandom",
+            side_effect=[b"\x00" * 6, b"\x01" * 6],
+        ):
+            write_bytes_content(self.test_file_path, b"New content\n")
+
+        self.assertFalse(os.path.islink(self.test_file_path))
+        self.assertEqual(self.read_test_file(), b"New content\n")
+        with open(victim_path, "rb") as f:
+            self.assertEqual(f.read(), b"Victim content\n")
+
+    def test_write_keeps_private_file_private(self):
+        """Test that new content is never readable beyond an existing file's mode"""
+        os.chmod(self.test_file_path, 0o600)
+        modes = []
+        real_write = os.write
+
+        def write(fd, data):
+            modes.append(stat.S_IMODE(os.fstat(fd).st_mode))
+            return real_write(fd, data)
+
+        with patch("codemcp.tools.file_utils.os.write", side_effect=write):
+            write_bytes_content(self.test_file_path, b"New content\n")
+
+        self.assertEqual(modes, [0o600])
+        self.assertEqual(self.read_test_file(), b"New content\n")
+
+    def test_write_new_file_uses_umask(self):
+        """Test that a new file gets the default permissions after the umask"""
+        umask = os.umask(0o022)
+        self.addCleanup(os.umask, umask)
+        new_path = os.path.join(self.temp_dir.name, "new_file.txt")
+
+        write_bytes_content(new_path, b"New content\n")
+
+        self.assertEqual(stat.S_IMODE(os.stat(new_path).st_mode), 0o644)
+
+    def test_write_hard_linked_file(self):
+        """Test that writing a hard-linked file updates every link"""
+        link_path = os.path.join(self.temp_dir.name, "link.txt")
+        os.link(self.test_file_path, link_path)
+
+        write_bytes_content(self.test_file_path, b"New content\n")
+
+        self.assertEqual(self.read_test_file(), b"New content\n")
+        with open(link_path, "rb") as f:
+            self.assertEqual(f.read(), b"New content\n")
+        self.assertTrue(os.path.samefile(self.test_file_path, link_path))
+
+    def test_write_preserves_mode(self):
+        """Test that the permission bits of an existing file are kept"""
+        os.chmod(self.test_file_path, 0o640)
+
+        write_bytes_content(self.test_file_path, b"New content\n")
+
+        self.assertEqual(self.read_test_file(), b"New content\n")
+        mode = stat.S_IMODE(os.stat(self.test_file_path).st_mode)
+        self.assertEqual(mode, 0o640)
+
+    @unittest.skipIf(
+        hasattr(os, "geteuid") and os.geteuid() == 0,
+        "root can write read-only files",
+    )
+    def test_write_read_only_file(self):
+        """Test that a read-only file is refused rather than replaced"""
+        os.chmod(self.test_file_path, 0o444)
+
+        with self.assertRaises(PermissionError):
+            write_bytes_content(self.test_file_path, b"New content\n")
+
+        self.assertEqual(self.read_test_file(), b"Initial content\n")
+
+    def test_write_skips_known_directory(self):
+        """Test that a directory is only created once per process"""
+        new_path = os.path.join(self.temp_dir.name, "subdir", "new_file.txt")
+
+        with patch(
+            "codemcp.tools.file_utils.os.makedirs", wraps=os.makedirs
+        ) as mock_makedirs:
+            write_bytes_content(new_path, b"First content\n")
+            write_bytes_content(new_path, b"Second content\n")
+
+        mock_makedirs.assert_called_once()
+        with open(new_path, "rb") as f:
+            self.assertEqual(f.read(), b"Second content\n")
+
+    def test_write_after_known_directory_removed(self):
+        """Test that a cached directory removed since is created again"""
+        directory = os.path.join(self.temp_dir.name, "subdir")
+        new_path = os.path.join(directory, "new_file.txt")
+        write_bytes_content(new_path, b"First content\n")
+
+        shutil.rmtree(directory)
+        write_bytes_content(new_path, b"Second content\n")
+
+        with open(new_path, "rb") as f:
+            self.assertEqual(f.read(), b"Second content\n")
+
+    def test_write_dangling_symlink_into_missing_directory(self):
+        """Test that a missing directory elsewhere is reported, not retried"""
+        link_path = os.path.join(self.temp_dir.name, "link.txt")
+        os.symlink(os.path.join(self.temp_dir.name, "missing", "target.txt"), link_path)
+        # Cache the directory holding the link
+        write_bytes_content(self.test_file_path, b"New content\n")
+
+        with patch(
+            "codemcp.tools.file_utils.os.makedirs", wraps=os.makedirs
+        ) as mock_makedirs:
+            with self.assertRaises(FileNotFoundError):
+                write_bytes_content(link_path, b"New content\n")
+
+        mock_makedirs.assert_not_called()
+        self.assertFalse(os.path.exists(os.path.join(self.temp_dir.name, "missing")))
+
+
+class TestRunFileOperation(unittest.IsolatedAsyncioTestCase):
+    async def test_same_file_is_serialized(self):
+        """Test that operations on the same file never overlap"""
+        active = 0
+        max_active = 0
+        counter_lock = threading.Lock()
+
+        def operation():
+            nonlocal active, max_active
+            with counter_lock:
+                active += 1
+                max_active = max(max_active, active)
+            time.sleep(0.01)
+            with counter_lock:
+                active -= 1
+
+        await asyncio.gather(
+            *(run_file_operation("/tmp/same_file.txt", operation) for _ in range(4))
+        )
+        self.assertEqual(max_active, 1)
+        self.assertEqual(file_utils._file_locks, {})
+
+    @unittest.skipIf(
+        file_utils._MAX_CONCURRENT_FILE_OPERATIONS < 2,
+        "only one file operation may run at a time",
+    )
+    async def test_different_files_run_concurrently(self):
+        """Test that operations on different files run at the same time"""
+        # Each operation waits for the other, so this only passes if they overlap
+        barrier = threading.Barrier(2, timeout=5)
+
+        await asyncio.gather(
+            run_file_operation("/tmp/first_file.txt", barrier.wait),
+            run_file_operation("/tmp/second_file.txt", barrier.wait),
+        )
+        self.assertEqual(file_utils._file_locks, {})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,257 @@
+#!/usr/bin/env python3
+
+import os
+import shutil
+import subprocess
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from codemcp.git import (
+    commit_changes,
+    commit_pending_changes,
+    invalidate_git_cache,
+    is_git_repository,
+)
+
+
+class TestGit(unittest.TestCase):
+    def setUp(self):
+        # Create a temporary directory for our tests
+        self.test_dir = os.path.realpath(tempfile.mkdtemp())
+        invalidate_git_cache()
+
+        # Initialize a git repository in the test directory
+        subprocess.run(
+            ["git", "init", "."],
+            cwd=self.test_dir,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            check=True,
+        )
+
+        # Configure git user for commits
+        subprocess.run(
+            ["git", "config", "user.email", "test@example.com"],
+            cwd=self.test_dir,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            check=True,
+        )
+
+        subprocess.run(
+            ["git", "config", "user.name", "Test User"],
+            cwd=self.test_dir,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            check=True,
+        )
+
+        # Create and commit a file
+        self.file_path = os.path.join(self.test_dir, "file.txt")
+        with open(self.file_path, "w") as f:
+            f.write("Initial content\n")
+
+        subprocess.run(
+            ["git", "add", "file.txt"],
+            cwd=self.test_dir,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            check=True,
+        )
+
+        subprocess.run(
+            ["git", "commit", "-m", "Initial commit"],
+            cwd=self.test_dir,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            check=True,
+        )
+
+    def tearDown(self):
+        invalidate_git_cache()
+        shutil.rmtree(self.test_dir)
+
+    def test_is_git_repository(self):
+        """Test detecting files and directories inside a git repository"""
+        self.assertTrue(is_git_repository(self.file_path))
+        self.assertTrue(is_git_repository(self.test_dir))
+
+    def test_is_not_git_repository(self):
+        """Test detecting a directory outside any git repository"""
+        outside_dir = tempfile.mkdtemp()
+        try:
+            self.assertFalse(is_git_repository(outside_dir))
+        finally:
+            shutil.rmtree(outside_dir)
+
+    def test_repository_cache_invalidation(self):
+        """Test that cached lookups are refreshed after invalidation"""
+        self.assertTrue(is_git_repository(self.test_dir))
+
+        # Remove the repository; the cached answer is still returned
+        shutil.rmtree(os.path.join(self.test_dir, ".git"))
+        self.assertTrue(is_git_repository(self.test_dir))
+
+        invalidate_git_cache()
+        self.assertFalse(is_git_repository(self.test_dir))
+
+    def test_commit_changes(self):
+        """Test committing a modified file"""
+        with open(self.file_path, "w") as f:
+            f.write("Modified content\n")
+
+        success, message = commit_changes(self.file_path, "Modify file")
+        self.assertTrue(success, message)
+
+        log = subprocess.run(
+            ["git", "log", "--format=%s"],
+            cwd=self.test_dir,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout
+        self.assertEqual(log.splitlines()[0], "Modify file")
+
+    def test_commit_changes_without_pygit2(self):
+        """Test the subprocess fallback used when pygit2 is not installed"""
+        with patch("codemcp.git._load_pygit2", return_value=None):
+            with open(self.file_path, "w") as f:
+                f.write("Modified content\n")
+
+            success, message = commit_changes(self.file_path, "Modify file")
+            self.assertTrue(success, message)
+
+            success, message = commit_pending_changes(self.file_path)
+            self.assertTrue(success, message)
+
+        status = subprocess.run(
+            ["git", "status", "--porcelain"],
+            cwd=self.test_dir,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout
+        self.assertEqual(status, "")
+
+    def test_commit_changes_runs_clean_filter(self):
+        """Test that files with a filter attribute go through git's clean filter"""
+        subprocess.run(
+            ["git", "config", "filter.upper.clean", "tr a-z A-Z"],
+            cwd=self.test_dir,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            check=True,
+        )
+        with open(os.path.join(self.test_dir, ".gitattributes"), "w") as f:
+            f.write("*.dat filter=upper\n")
+
+        data_path = os.path.join(self.test_dir, "file.dat")
+        with open(data_path, "w") as f:
+            f.write("lower case\n")
+
+        success, message = commit_changes(data_path, "Add data file")
+        self.assertTrue(success, message)
+
+        blob = subprocess.run(
+            ["git", "show", "HEAD:file.dat"],
+            cwd=self.test_dir,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout
+        self.assertEqual(blob, "LOWER CASE\n")
+
+    def test_commit_changes_applies_working_tree_encoding(self):
+        """Test that files are re-encoded from their working tree encoding"""
+        with open(os.path.join(self.test_dir, ".gitattributes"), "w") as f:
+            f.write("*.utf16 working-tree-encoding=UTF-16LE-BOM\n")
+
+        data_path = os.path.join(self.test_dir, "file.utf16")
+        with open(data_path, "w", encoding="utf-16") as f:
+            f.write("hello\n")
+
+        success, message = commit_changes(data_path, "Add UTF-16 file")
+        self.assertTrue(success, message)
+
+        blob = subprocess.run(
+            ["git", "cat-file", "blob", "HEAD:file.utf16"],
+            cwd=self.test_dir,
+            capture_output=True,
+            check=True,
+        ).stdout
+        self.assertEqual(blob, b"hello\n")
+
+    def test_commit_directory_snapshot(self):
+        """Test that committing a directory stages everything in it"""
+        written_path = os.path.join(self.test_dir, "written.txt")
+        with open(written_path, "w") as f:
+            f.write("Written by codemcp\n")
+
+        other_path = os.path.join(self.test_dir, "other.txt")
+        with open(other_path, "w") as f:
+            f.write("Written by someone else\n")
+
+        success, message = commit_changes(self.test_dir, "Snapshot")
+        self.assertTrue(success, message)
+
+        files = subprocess.run(
+            ["git", "show", "--name-only", "--format=", "HEAD"],
+            cwd=self.test_dir,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout
+        self.assertEqual(sorted(files.split()), ["other.txt", "written.txt"])
+
+    def test_commit_pending_changes_untracked_file(self):
+        """Test that pending changes are refused for an untracked file"""
+        untracked_path = os.path.join(self.test_dir, "untracked.txt")
+        with open(untracked_path, "w") as f:
+            f.write("Untracked content\n")
+
+        success, message = commit_pending_changes(untracked_path)
+        self.assertFalse(success)
+        self.assertIn("File is not tracked by git", message)
+
+    def test_commit_pending_changes_file_added_later(self):
+        """Test that a file staged after the tracked list was cached is seen"""
+        new_path = os.path.join(self.test_dir, "new.txt")
+        with open(new_path, "w") as f:
+            f.write("New content\n")
+
+        # Populate the cache before the file is tracked
+        success, _ = commit_pending_changes(self.file_path)
+        self.assertTrue(success)
+
+        subprocess.run(
+            ["git", "add", "new.txt"],
+            cwd=self.test_dir,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            check=True,
+        )
+
+        success, message = commit_pending_changes(new_path)
+        self.assertTrue(success, message)
+
+    def test_commit_pending_changes_file_removed_from_index(self):
+        """Test that a file removed from the index is no longer tracked"""
+        success, _ = commit_pending_changes(self.file_path)
+        self.assertTrue(success)
+
+        subprocess.run(
+            ["git", "rm", "--cached", "file.txt"],
+            cwd=self.test_dir,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            check=True,
+        )
+
+        success, message = commit_pending_changes(self.file_path)
+        self.assertFalse(success)
+        self.assertIn("File is not tracked by git", message)
+
+
+if __name__ == "__main__":
+    unittest.main()
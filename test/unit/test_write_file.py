@@ -7,6 +7,7 @@ from unittest.mock import patch
 
 from expecttest import TestCase
 
+from codemcp.tools import write_file
 from codemcp.tools.file_utils import write_text_content
 from codemcp.tools.write_file import (
     detect_file_encoding,
@@ -251,5 +252,66 @@ class TestWriteFile(TestCase):
         self.assertEqual(written_content, content)
 
 
+class TestWriteFileLineEndings(TestCase):
+    def setUp(self):
+        # Create a temporary directory for test files
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.temp_dir.cleanup)
+
+        self.test_file_path = os.path.join(self.temp_dir.name, "test_file.txt")
+
+        # Bypass the git repository check used for permissions
+        git_base_dir_patch = patch("codemcp.access.get_git_base_dir")
+        self.mock_git_base_dir = git_base_dir_patch.start()
+        self.mock_git_base_dir.return_value = self.temp_dir.name
+        self.addCleanup(git_base_dir_patch.stop)
+
+        # Create a codemcp.toml file to satisfy the permission check
+        config_path = os.path.join(self.temp_dir.name, "codemcp.toml")
+        with open(config_path, "w") as f:
+            f.write("[codemcp]\nenabled = true\n")
+
+        # Count reads of the existing file
+        sniff_patch = patch(
+            "codemcp.tools.write_file._sniff_file", wraps=write_file._sniff_file
+        )
+        self.mock_sniff_file = sniff_patch.start()
+        self.addCleanup(sniff_patch.stop)
+
+    def write_test_file(self, data):
+        with open(self.test_file_path, "wb") as f:
+            f.write(data)
+
+    def read_test_file(self):
+        with open(self.test_file_path, "rb") as f:
+            return f.read()
+
+    def test_write_ascii_to_lf_file(self):
+        """Test that ASCII content for an LF file is written as-is"""
+        self.write_test_file(b"Old content\n")
+
+        with patch("codemcp.tools.write_file.write_text_content") as mock_write:
+            result = write_file_content(self.test_file_path, "New\ncontent\n")
+            mock_write.assert_not_called()
+
+        self.assertEqual(result, f"Successfully wrote to {self.test_file_path}")
+        self.assertEqual(self.read_test_file(), b"New\ncontent\n")
+        self.mock_sniff_file.assert_called_once_with(
+            self.test_file_path, detect_encoding=False
+        )
+
+    def test_write_ascii_to_crlf_file(self):
+        """Test that ASCII content for a CRLF file gets CRLF with one read"""
+        self.write_test_file(b"Old content\r\n")
+
+        result = write_file_content(self.test_file_path, "New\ncontent\n")
+
+        self.assertEqual(result, f"Successfully wrote to {self.test_file_path}")
+        self.assertEqual(self.read_test_file(), b"New\r\ncontent\r\n")
+        self.mock_sniff_file.assert_called_once_with(
+            self.test_file_path, detect_encoding=False
+        )
+
+
 if __name__ == "__main__":
     unittest.main()